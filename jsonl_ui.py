@@ -3,65 +3,314 @@
 Restored JSONL Viewer/Editor — full traversal, schema inference, working templates.
 """
 
-import os
+import asyncio
+import html
 import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from array import array
+from collections import defaultdict
+from contextlib import suppress
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
+from typing import Optional
+import orjson
 from fastapi import FastAPI, Request, Query
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from jinja2 import Environment, FileSystemLoader
-from jsonschema import validate as js_validate, ValidationError
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+import fastjsonschema
+from fastjsonschema import JsonSchemaException
 
 BASE_DIR = Path(__file__).resolve().parent
 TEMPLATES_DIR = BASE_DIR / "templates"
 STATIC_DIR = BASE_DIR / "static"
 
-ROOT_DIRS = ["/"]
-SKIP_DIRS = {
+# Same VIEWER_SEARCH_ROOTS / VIEWER_SKIP_DIRS (os.pathsep-separated) as jvu.py and viewer.py
+ROOT_DIRS = [p for p in os.getenv("VIEWER_SEARCH_ROOTS", "/").split(os.pathsep) if p.strip()]
+DEFAULT_SKIP_DIRS = {
     "/proc", "/sys", "/dev", "/run", "/snap", "/tmp",
     "/.Trash", "/lost+found", "/var/lib/docker"
 }
-
-app = FastAPI(title="JSONL Viewer/Editor")
-env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
-env.cache = {}
+_skip_raw = os.getenv("VIEWER_SKIP_DIRS")
+SKIP_DIRS = DEFAULT_SKIP_DIRS if _skip_raw is None else {p for p in _skip_raw.split(os.pathsep) if p.strip()}
+# str.startswith takes a tuple: one C-level call instead of a genexpr per dir
+_SKIP_PREFIXES = tuple(SKIP_DIRS)
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that falls back to JSONResponse's stdlib encoder for values orjson rejects."""
+    def render(self, content) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:  # orjson.JSONEncodeError: int wider than 64 bits
+            return JSONResponse.render(self, content)
+
+
+app = FastAPI(title="JSONL Viewer/Editor", default_response_class=FastJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+JINJA_CACHE_DIR = BASE_DIR / ".jinja_cache"
+try:
+    JINJA_CACHE_DIR.mkdir(exist_ok=True)
+    _bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR), "%s.cache")
+except OSError as e:
+    print(f"[jsonl_ui] Warning: bytecode cache disabled: {e}")
+    _bytecode_cache = None
+env = Environment(
+    loader=FileSystemLoader(str(TEMPLATES_DIR)),
+    bytecode_cache=_bytecode_cache,
+    auto_reload=os.getenv("VIEWER_DEV") == "1",
+    cache_size=400,
+)
+
+# Like `find -xdev`: don't descend into other mounts (off by default so / still reaches /home)
+SAME_FILESYSTEM = os.getenv("VIEWER_SAME_FS") == "1"
+
+# Opt-in: save via temp file + os.replace and keep the previous version as .bak.
+# Off by default because the new inode drops ACLs/xattrs and needs a writable directory.
+ATOMIC_SAVE = os.getenv("VIEWER_ATOMIC_SAVE") == "1"
+
+# Full-disk walks are expensive; reuse the last result for a few seconds
+LIST_CACHE_TTL = 5.0
+STREAM_CHUNK_BYTES = 64 * 1024
+WRITE_CHUNK_BYTES = 1024 * 1024
+READ_CHUNK_BYTES = 1024 * 1024
+_LIST_CACHE = {"key": None, "ts": 0.0, "files": []}
 
 
 
 # --- UTILITIES ----------------------------------------------------------------
+def _roots_signature() -> tuple:
+    sig = []
+    for root in ROOT_DIRS:
+        try:
+            sig.append((root, os.stat(root).st_mtime_ns))
+        except OSError:
+            sig.append((root, None))
+    return tuple(sig)
+
+
 def list_jsonl_files() -> list[Path]:
+    """Cached wrapper around _scan_jsonl_files (keyed on root mtimes + TTL)."""
+    key = _roots_signature()
+    now = time.monotonic()
+    if _LIST_CACHE["key"] == key and now - _LIST_CACHE["ts"] < LIST_CACHE_TTL:
+        return _LIST_CACHE["files"]
+    files = _scan_jsonl_files()
+    _LIST_CACHE.update(key=key, ts=now, files=files)
+    return files
+
+
+def _first_visit(path: str, seen: set, root_dev) -> bool:
+    """True the first time a (dev, inode) pair is reached; drops bind-mount repeats."""
+    try:
+        st = os.stat(path, follow_symlinks=False)
+    except OSError:
+        return False
+    if root_dev is not None and st.st_dev != root_dev:
+        return False
+    key = (st.st_dev, st.st_ino)
+    if key in seen:
+        return False
+    seen.add(key)
+    return True
+
+
+def _scan_jsonl_files() -> list[Path]:
     files = []
+    seen = set()
     for root in ROOT_DIRS:
+        try:
+            root_dev = os.stat(root).st_dev if SAME_FILESYSTEM else None
+        except OSError:
+            continue
+        if not _first_visit(root, seen, root_dev):
+            continue
         for dirpath, dirnames, filenames in os.walk(root, topdown=True, followlinks=False):
-            dirnames[:] = [
-                d for d in dirnames
-                if not any((Path(dirpath) / d).as_posix().startswith(sd) for sd in SKIP_DIRS)
-            ]
+            kept = []
+            for d in dirnames:
+                full = os.path.join(dirpath, d)
+                if not full.startswith(_SKIP_PREFIXES) and _first_visit(full, seen, root_dev):
+                    kept.append(d)
+            dirnames[:] = kept
             for f in filenames:
                 if f.endswith(".jsonl"):
-                    p = Path(dirpath) / f
+                    full = os.path.join(dirpath, f)
                     try:
-                        if p.is_file():
-                            files.append(p)
+                        if os.path.isfile(full):
+                            files.append(Path(full))
                     except (PermissionError, OSError):
                         continue
     return sorted(files)
 
 
-def read_jsonl(path: Path) -> list:
-    rows = []
+# orjson silently turns integers wider than 64 bits into floats
+_LONG_DIGITS = re.compile(rb"\d{19,}")
+
+
+def _loads(line: bytes):
+    """orjson.loads, re-parsed with stdlib json when a 19+ digit run could be a wide int."""
+    obj = orjson.loads(line)
+    if _LONG_DIGITS.search(line):
+        return json.loads(line)
+    return obj
+
+
+def _dumps(obj) -> bytes:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        rows.append(json.loads(line))
-                    except json.JSONDecodeError as e:
-                        rows.append({"_error": str(e), "_raw": line})
+        return orjson.dumps(obj)
+    except TypeError:  # orjson.JSONEncodeError: int wider than 64 bits
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _iter_rows(f):
+    for line in f:
+        if line.isspace():
+            continue
+        try:
+            yield _loads(line)
+        except orjson.JSONDecodeError as e:
+            yield {"_error": str(e), "_raw": line.strip().decode("utf-8", "replace")}
+
+
+def _open_sequential(path):
+    """Open for a front-to-back read: large buffer plus a readahead hint for cold files."""
+    f = open(path, "rb", buffering=READ_CHUNK_BYTES)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return f
+
+
+def iter_jsonl(path: Path, start: int = 0):
+    """Yield one parsed row per non-blank line, starting at byte offset `start`."""
+    try:
+        with _open_sequential(path) as f:
+            if start:
+                f.seek(start)
+            yield from _iter_rows(f)
     except (FileNotFoundError, PermissionError) as e:
-        rows.append({"_error": str(e)})
-    return rows
+        yield {"_error": str(e)}
+
+
+# 8 bytes per line (~80 MB for a 10M-line file) and every save orphans an entry: keep few
+@lru_cache(maxsize=4)
+def _offset_index(path_str: str, mtime_ns: int, size: int) -> array:
+    """Byte offset of every non-blank line; mtime/size in the key invalidate it."""
+    offsets = array("Q")
+    pos = 0
+    with _open_sequential(path_str) as f:
+        for line in f:
+            if not line.isspace():
+                offsets.append(pos)
+            pos += len(line)
+    return offsets
+
+
+def read_jsonl(path: Path, offset: int = 0, limit: Optional[int] = None) -> list:
+    if not offset:
+        # First page: just stop reading after `limit` rows, no index needed
+        return list(islice(iter_jsonl(path), limit))
+    try:
+        st = path.stat()
+        offsets = _offset_index(str(path), st.st_mtime_ns, st.st_size)
+    except OSError:
+        end = offset + limit if limit is not None else None
+        return list(islice(iter_jsonl(path), offset, end))
+    if offset >= len(offsets):
+        return []
+    return list(islice(iter_jsonl(path, offsets[offset]), limit))
+
+
+def read_first_rows(path: Path, n: int = 1) -> list:
+    """Parse only the first n non-blank lines (schema inference needs no more)."""
+    return list(islice(iter_jsonl(path), n))
+
+
+def _json_array_chunks(rows, chunk_size: int = STREAM_CHUNK_BYTES):
+    """Serialize rows as one JSON array, emitted in ~chunk_size byte pieces."""
+    buf = bytearray(b"[")
+    first = True
+    for row in rows:
+        if not first:
+            buf += b","
+        buf += _dumps(row)
+        first = False
+        if len(buf) >= chunk_size:
+            yield bytes(buf)
+            buf.clear()
+    buf += b"]"
+    yield bytes(buf)
+
+
+def _write_rows(f, rows):
+    buf = bytearray()
+    for row in rows:
+        buf += _dumps(row)
+        buf += b"\n"
+        if len(buf) >= WRITE_CHUNK_BYTES:
+            f.write(buf)
+            buf.clear()
+    f.write(buf)
+
+
+def _replace_jsonl(path: Path, fd: int, tmp: str, rows: list):
+    """Fill the temp file, then swap it over path; the replaced version becomes path.bak."""
+    try:
+        with os.fdopen(fd, "wb") as f:
+            _write_rows(f, rows)
+            f.flush()
+            os.fsync(f.fileno())
+        st = path.stat()
+        with suppress(OSError):  # giving a file away needs root; keep whatever we can
+            os.chown(tmp, st.st_uid, st.st_gid)
+        os.chmod(tmp, st.st_mode & 0o7777)
+        # Refresh the backup on every save; a hard link costs no data copy
+        backup = path.with_suffix(path.suffix + ".bak")
+        with suppress(OSError):
+            os.unlink(backup)
+        try:
+            os.link(path, backup)
+        except OSError:
+            # No hard links on this filesystem (EPERM/ENOTSUP): copy instead; the backup is best-effort
+            with suppress(OSError):
+                shutil.copy2(path, backup)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def write_jsonl(path: Path, rows: list):
+    """Rewrite path in place, or swap in a temp file when ATOMIC_SAVE is on."""
+    # Replace the symlink's target, not the link itself
+    path = Path(os.path.realpath(path))
+    if ATOMIC_SAVE:
+        try:
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        except OSError:
+            pass  # read-only directory: the file itself may still be writable
+        else:
+            return _replace_jsonl(path, fd, tmp, rows)
+    with open(path, "wb") as f:
+        _write_rows(f, rows)
+
+
+# Python type -> JSON Schema fragment (exact type lookup keeps bool apart from int)
+_TYPE_MAP = {
+    dict: {"type": "object"},
+    list: {"type": "array"},
+    str: {"type": "string"},
+    int: {"type": "number"},
+    float: {"type": "number"},
+    bool: {"type": "boolean"},
+    type(None): {"type": "null"},
+}
+_DEFAULT_TYPE = {"type": "string"}
 
 
 def infer_schema(rows):
@@ -69,23 +318,89 @@ def infer_schema(rows):
         return {"type": "object"}
     sample = rows[0]
     if isinstance(sample, dict):
-        props = {k: {"type": type(v).__name__} for k, v in sample.items()}
+        props = {k: _TYPE_MAP.get(type(v), _DEFAULT_TYPE) for k, v in sample.items()}
         return {"type": "object", "properties": props}
-    elif isinstance(sample, list):
-        return {"type": "array"}
-    return {"type": type(sample).__name__}
+    return _TYPE_MAP.get(type(sample), _DEFAULT_TYPE)
+
+
+@lru_cache(maxsize=512)
+def _schema_for(path_str: str, mtime_ns: int, size: int) -> dict:
+    return infer_schema(read_first_rows(Path(path_str)))
+
+
+def schema_for(path: Path) -> dict:
+    """infer_schema for a file, memoized on (path, mtime, size)."""
+    try:
+        st = path.stat()
+    except OSError:
+        return infer_schema(read_first_rows(path))
+    return _schema_for(str(path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=64)
+def _compiled_validator(schema_key: bytes):
+    """fastjsonschema codegen is costly; reuse the function per distinct schema."""
+    return fastjsonschema.compile(orjson.loads(schema_key))
+
+
+# _loads only ever produces these types; count them in fixed slots 1..7 of a
+# per-key list (slot 0 = rows containing the key) instead of hashing type names
+_TYPE_NAMES = ("dict", "list", "str", "int", "float", "bool", "NoneType")
+_TYPE_SLOT = {dict: 1, list: 2, str: 3, int: 4, float: 5, bool: 6, type(None): 7}
+
+
+def schema_info(file_path: Path) -> dict:
+    """Per-key type counts and coverage over the first ~20 records."""
+    key_stats = defaultdict(lambda: [0] * 8)
+    total = 0
+
+    # Read only a limited number of lines; bytes straight into orjson, no decode/strip copies
+    with open(file_path, "rb") as f:
+        for i, line in enumerate(f):
+            if line.isspace():
+                continue
+            try:
+                obj = _loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if not isinstance(obj, dict):
+                continue
+            total += 1
+            for key, val in obj.items():
+                e = key_stats[key]
+                e[0] += 1
+                e[_TYPE_SLOT[type(val)]] += 1
+            if i >= 20:
+                break
+
+    # Summarize
+    schema = []
+    for key, e in key_stats.items():
+        schema.append({
+            "key": key,
+            "types": {name: n for name, n in zip(_TYPE_NAMES, e[1:]) if n},
+            "coverage": round(e[0] / total * 100, 1),
+        })
+
+    return {"records_scanned": total, "schema": schema}
+
+
+@lru_cache(maxsize=512)
+def _render_file_shell(name: str) -> str:
+    """file.html only varies by name; bypassed under VIEWER_DEV so edits show up."""
+    return env.get_template("file.html").render(name=name)
 
 
 # --- ROUTES -------------------------------------------------------------------
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    files = [str(p) for p in list_jsonl_files()]
+    # index.html fetches its listing client-side; don't walk the disk before the first byte
     template = env.get_template("index.html")
-    return template.render(request=request, files=files)
+    return template.render(request=request)
 
 
 @app.get("/view/{path:path}", response_class=HTMLResponse)
-async def view_file(request: Request, path: str):
+def view_file(request: Request, path: str):
     """Serve the grid view template directly."""
     # Normalize to absolute path
     if not path.startswith("/"):
@@ -94,10 +409,10 @@ async def view_file(request: Request, path: str):
     fpath = Path(path)
 
     if not fpath.exists():
-        return HTMLResponse(f"<h1>File not found:</h1><pre>{path}</pre>", status_code=404)
-    template = env.get_template("file.html")
-
-    return template.render(request=request, name=str(fpath))
+        return HTMLResponse(f"<h1>File not found:</h1><pre>{html.escape(path)}</pre>", status_code=404)
+    if env.auto_reload:
+        return env.get_template("file.html").render(name=str(fpath))
+    return _render_file_shell(str(fpath))
 
 
 @app.get("/api/files")
@@ -108,25 +423,24 @@ def api_files():
         if not full.startswith("/"):
             full = "/" + full
         files.append(full)
-    return JSONResponse(files)
+    return files
 
 
 @app.get("/api/read")
-def api_read(name: str):
+def api_read(name: str, offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1)):
     if not name.startswith("/"):
         name = "/" + name
     path = Path(name)
-    rows = read_jsonl(path)
-    return JSONResponse(rows)
+    rows = read_jsonl(path, offset, limit) if offset or limit is not None else iter_jsonl(path)
+    return StreamingResponse(_json_array_chunks(rows), media_type="application/json")
 
 
 @app.get("/api/infer_schema")
 def api_infer_schema(name: str):
     if not name.startswith("/"):
         name = "/" + name
-    rows = read_jsonl(Path(name))
-    schema = infer_schema(rows)
-    return JSONResponse(schema)
+    schema = schema_for(Path(name))
+    return schema
 
 
 @app.post("/api/save")
@@ -136,45 +450,39 @@ async def api_save(request: Request):
     path = Path(body.get("name"))
     data = body.get("data")
     if not path.exists():
-        return JSONResponse({"error": f"File not found: {path}"}, status_code=404)
+        return ORJSONResponse({"error": f"File not found: {path}"}, status_code=404)
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            for row in data:
-                json.dump(row, f, ensure_ascii=False)
-                f.write("\n")
-        return JSONResponse({"ok": True, "records": len(data)})
+        await asyncio.to_thread(write_jsonl, path, data)
+        return {"ok": True, "records": len(data)}
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
 @app.post("/api/validate")
 def api_validate(name: str):
     path = Path(name)
     rows = read_jsonl(path)
-    schema = infer_schema(rows)
+    schema = schema_for(path)
+    validator = _compiled_validator(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS))
     errors = []
     for i, row in enumerate(rows):
         try:
-            js_validate(instance=row, schema=schema)
-        except ValidationError as e:
+            validator(row)
+        except JsonSchemaException as e:
             errors.append({"index": i, "error": e.message})
-    return JSONResponse({"ok": not errors, "errors": errors, "schema": schema})
+    return {"ok": not errors, "errors": errors, "schema": schema}
 
 
 @app.get("/download/{path:path}")
 def download(path: str):
     fpath = Path(path)
     if not fpath.exists():
-        return JSONResponse({"error": "File not found"}, status_code=404)
+        return ORJSONResponse({"error": "File not found"}, status_code=404)
     return FileResponse(fpath)
 
 
 @app.get("/api/schema")
 async def get_schema(name: str = Query(...)):
-    import json
-    from collections import Counter, defaultdict
-    from pathlib import Path
-
     # Normalize absolute path
     if not name.startswith("/"):
         name = "/" + name
@@ -183,35 +491,7 @@ async def get_schema(name: str = Query(...)):
     if not file_path.exists():
         return {"error": f"File not found: {name}"}
 
-    type_map = defaultdict(Counter)
-    total = 0
-
-    # Read only a limited number of lines
-    with open(file_path, "r", encoding="utf-8") as f:
-        for i, line in enumerate(f):
-            if not line.strip():
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                continue
-            total += 1
-            for key, val in obj.items():
-                t = type(val).__name__
-                type_map[key][t] += 1
-            if i >= 20:
-                break
-
-    # Summarize
-    schema = []
-    for key, counts in type_map.items():
-        schema.append({
-            "key": key,
-            "types": dict(counts),
-            "coverage": round(sum(counts.values()) / total * 100, 1),
-        })
-
-    return {"records_scanned": total, "schema": schema}
+    return await asyncio.to_thread(schema_info, file_path)
 
 
 
@@ -223,5 +503,5 @@ if STATIC_DIR.exists():
 # --- ENTRYPOINT ---------------------------------------------------------------
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("viewer:app", host="127.0.0.1", port=8002, reload=True)
+    uvicorn.run("jsonl_ui:app", host="127.0.0.1", port=8002, reload=os.getenv("VIEWER_DEV") == "1")
 
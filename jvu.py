@@ -12,13 +12,21 @@ Features:
 """
 
 from __future__ import annotations
-import os, json, gzip, fnmatch, time, uuid, logging, subprocess
+import os, re, json, gzip, fnmatch, itertools, time, logging, threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
 
 # ---------- Optional imports ----------
 try:
@@ -31,6 +39,28 @@ try:
 except Exception:
     yaml = None
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# orjson silently turns integers wider than 64 bits into floats; lines with a
+# 19+ digit run are re-parsed with stdlib json so they stay exact
+_LONG_DIGITS = re.compile(rb"\d{19,}")
+
+def _loads(data: bytes):
+    if orjson is None or _LONG_DIGITS.search(data):
+        return json.loads(data)
+    return orjson.loads(data)
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:  # orjson.JSONEncodeError: int wider than 64 bits
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
 load_dotenv()
 
 # ---------- Config Loading ----------
@@ -71,18 +101,59 @@ if skip_dirs_raw is None:
 SKIP_DIRS = {str(Path(s).resolve()) for s in skip_dirs_raw.split(os.pathsep) if s.strip()}
 
 PRUNE_GLOBS = [g for g in os.getenv("VIEWER_PRUNE_GLOBS", "").split(os.pathsep) if g.strip()]
+# All globs fused into one alternation so each path costs a single regex match
+_PRUNE_RE = re.compile("|".join(f"(?:{fnmatch.translate(g)})" for g in PRUNE_GLOBS)) if PRUNE_GLOBS else None
 RELOAD_DIRS = [p for p in (os.getenv("VIEWER_RELOAD_DIRS") or os.pathsep.join([str(BASE_DIR), str(TEMPLATES_DIR)])).split(os.pathsep) if p.strip()]
 HOST = os.getenv("VIEWER_HOST", CFG.get("host", "127.0.0.1"))
 PORT = int(os.getenv("VIEWER_PORT", CFG.get("port", 8002)))
-RELOAD = (os.getenv("VIEWER_RELOAD", str(CFG.get("reload", "true"))).lower() == "true")
+RELOAD = (os.getenv("VIEWER_RELOAD", str(CFG.get("reload", os.getenv("VIEWER_DEV") == "1"))).lower() == "true")
 MAX_FILES = int(os.getenv("VIEWER_MAX_FILES", str(CFG.get("max_files", 5000))))
+SAME_FS = (os.getenv("VIEWER_SAME_FS", str(CFG.get("same_fs", "false"))).lower() in ("1", "true"))
 LOG_LEVEL = os.getenv("VIEWER_LOG_LEVEL", "INFO").upper()
+TREE_CACHE_TTL = float(os.getenv("VIEWER_TREE_CACHE_TTL", str(CFG.get("tree_cache_ttl", 30))))
+TREE_CACHE_SIZE = 512
+FILES_CACHE_TTL = float(os.getenv("VIEWER_FILES_CACHE_TTL", str(CFG.get("files_cache_ttl", 10))))
+FILES_CACHE_SIZE = 32
 
 logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("jvu")
 
 # ---------- App ----------
-app = FastAPI(title="JVU — JSON/JSONL Viewer")
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that falls back to JSONResponse's stdlib encoder for values orjson rejects."""
+    def render(self, content) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:  # orjson.JSONEncodeError: int wider than 64 bits
+            return JSONResponse.render(self, content)
+
+class _NDJSONPassthroughResponder(GZipResponder):
+    """GZipResponder that sends NDJSON streams as is: gzip would hold each short line back."""
+    passthrough = False
+
+    async def send_with_gzip(self, message) -> None:
+        if message["type"] == "http.response.start":
+            ctype = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = ctype.startswith("application/x-ndjson")
+        if self.passthrough:
+            await self.send(message)
+        else:
+            await super().send_with_gzip(message)
+
+class _GZipMiddleware(GZipMiddleware):
+    """GZip for everything except application/x-ndjson, whose records must go out as they're produced."""
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _NDJSONPassthroughResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+app = FastAPI(
+    title="JVU — JSON/JSONL Viewer",
+    default_response_class=FastJSONResponse if orjson else JSONResponse,
+)
+app.add_middleware(_GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 if STATIC_DIR.exists():
     app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
@@ -92,68 +163,154 @@ else:
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR)) if TEMPLATES_DIR.exists() else None
 if not templates:
     print(f"[jvu] Warning: templates dir missing: {TEMPLATES_DIR}")
+else:
+    # Compiled templates survive restarts; only re-stat sources when reloading
+    JINJA_CACHE_DIR = BASE_DIR / ".jinja_cache"
+    try:
+        JINJA_CACHE_DIR.mkdir(exist_ok=True)
+        templates.env.bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE_DIR), "%s.cache")
+    except OSError as e:
+        print(f"[jvu] Warning: bytecode cache disabled: {e}")
+    templates.env.auto_reload = RELOAD
 
 # ---------- Host Info ----------
+@lru_cache(maxsize=1)
 def _host_info() -> Dict[str, str]:
-    hostname = os.uname().nodename if hasattr(os, "uname") else os.getenv("HOSTNAME", "")
-    try:
-        out = subprocess.check_output(["uname", "-a"], text=True).strip()
-    except Exception:
-        out = ""
-    return {"hostname": hostname, "uname": out}
+    # Fixed for the process lifetime; built from os.uname() rather than forking `uname -a`
+    if not hasattr(os, "uname"):
+        return {"hostname": os.getenv("HOSTNAME", ""), "uname": ""}
+    u = os.uname()
+    return {"hostname": u.nodename, "uname": f"{u.sysname} {u.nodename} {u.release} {u.version} {u.machine}"}
 
 # ---------- Middleware ----------
+# Seeded from the clock so ids don't repeat across restarts in the same log
+_RID_COUNTER = itertools.count(int(time.time()) & 0xFFFFFFFF)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    rid = uuid.uuid4().hex[:8]
-    t0 = time.time()
+    rid = f"{next(_RID_COUNTER) & 0xFFFFFFFF:08x}"
+    t0 = time.perf_counter()
     logger.info("[req %s] %s %s", rid, request.method, request.url.path)
     try:
         resp = await call_next(request)
     except Exception:
         logger.exception("[req %s] unhandled", rid)
         raise
-    dt = (time.time() - t0) * 1000.0
+    dt = (time.perf_counter() - t0) * 1000.0
     logger.info("[res %s] %s %s -> %s in %.1fms", rid, request.method, request.url.path, resp.status_code, dt)
     return resp
 
 # ---------- Helpers ----------
+_TREE_CACHE: OrderedDict[tuple, tuple[float, List[Dict[str, str]]]] = OrderedDict()
+_TREE_LOCK = threading.Lock()
+_FILES_CACHE: OrderedDict[tuple, tuple[float, List[str]]] = OrderedDict()
+_FILES_LOCK = threading.Lock()
+
+_READ_BUF_SIZE = 128 * 1024  # same as gzip.READ_BUFFER_SIZE; 16x fewer read() calls than the 8 KB default
+
 def _norm_exts(exts: List[str]) -> List[str]:
     return [(e if e.startswith('.') else f'.{e}').lower() for e in exts]
 
-def _prune_dir(path: Path) -> bool:
-    try:
-        rp = str(path.resolve())
-    except Exception:
-        rp = str(path)
-    if rp in SKIP_DIRS:
+@lru_cache(maxsize=64)
+def _parse_exts(ext_str: str) -> frozenset:
+    """Parse a raw `ext` query string ("json,jsonl") once per distinct value."""
+    return frozenset(_norm_exts([e.strip() for e in ext_str.split(",") if e.strip()]))
+
+def _suffix(name: str) -> str:
+    """Lowercased Path(name).suffix without building a Path."""
+    dot = name.rfind(".")
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+
+def _prune_dir(path: str) -> bool:
+    """`path` must already be absolute; no resolve() so no stat per entry."""
+    if path in SKIP_DIRS:
         return True
-    for pat in PRUNE_GLOBS:
-        if fnmatch.fnmatch(rp, pat):
-            return True
-    return False
-
-def iter_tree(path: Path, exts: List[str]) -> List[Dict[str, str]]:
-    out: List[Dict[str, str]] = []
-    exts = _norm_exts(exts)
+    return _PRUNE_RE is not None and _PRUNE_RE.match(path) is not None
+
+def iter_tree(path: Path, ext_set: frozenset) -> List[Dict[str, str]]:
+    """Cached listing; a directory's mtime changes whenever entries are added/removed."""
+    base = path.resolve()
     try:
-        entries = sorted(path.iterdir(), key=lambda p: (p.is_file(), p.name.lower()))
+        mtime = base.stat().st_mtime_ns
+    except OSError:
+        return []
+    key = (str(base), mtime, ext_set)
+    now = time.monotonic()
+    with _TREE_LOCK:
+        hit = _TREE_CACHE.get(key)
+        if hit and now - hit[0] < TREE_CACHE_TTL:
+            _TREE_CACHE.move_to_end(key)
+            return hit[1]
+    nodes = _scan_tree(base, ext_set)
+    with _TREE_LOCK:
+        _TREE_CACHE[key] = (now, nodes)
+        _TREE_CACHE.move_to_end(key)
+        while len(_TREE_CACHE) > TREE_CACHE_SIZE:
+            _TREE_CACHE.popitem(last=False)
+    return nodes
+
+def _scan_tree(path: Path, ext_set: frozenset) -> List[Dict[str, str]]:
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                if _prune_dir(e.path):
+                    continue
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dirs.append(e)
+                elif not ext_set or _suffix(e.name) in ext_set:
+                    files.append(e)
     except PermissionError:
         return []
-    for p in entries:
-        if _prune_dir(p):
-            continue
-        if p.is_dir():
-            out.append({"type": "dir", "name": p.name, "path": str(p.resolve())})
-        else:
-            if exts and p.suffix.lower() not in exts:
-                continue
-            out.append({"type": "file", "name": p.name, "path": str(p.resolve())})
+    dirs.sort(key=lambda e: e.name.lower())
+    files.sort(key=lambda e: e.name.lower())
+    out: List[Dict[str, str]] = [{"type": "dir", "name": e.name, "path": e.path} for e in dirs]
+    out.extend({"type": "file", "name": e.name, "path": e.path} for e in files)
     return out
 
+def iter_files(root: str, ext_set: frozenset, same_fs: bool = False) -> Iterator[str]:
+    """Depth-first scandir walk (os.walk order) yielding matching file paths.
+
+    With same_fs, subdirectories on another device (other mounts) are pruned,
+    like `find -xdev`.
+    """
+    try:
+        root_dev = os.stat(root).st_dev if same_fs else None
+    except OSError:
+        return
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if entry.is_symlink() or _prune_dir(entry.path):
+                            continue
+                        if root_dev is not None:
+                            try:
+                                if entry.stat(follow_symlinks=False).st_dev != root_dev:
+                                    continue
+                            except OSError:
+                                continue
+                        subdirs.append(entry.path)
+                    elif not ext_set or _suffix(entry.name) in ext_set:
+                        yield entry.path
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
 def _safe_json(path: Path):
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        with open(path, "r", encoding="utf-8", errors="ignore", buffering=_READ_BUF_SIZE) as f:
             data = json.load(f)
         return data if isinstance(data, list) else [data]
     except Exception as e:
@@ -162,38 +319,65 @@ def _safe_json(path: Path):
 def _safe_jsonl(path: Path, limit: int = 5000):
     out = []
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            for i, line in enumerate(f, 1):
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    out.append(json.loads(line))
-                except Exception:
-                    out.append({"_raw": line})
-                if i >= limit:
-                    break
+        with open(path, "rb", buffering=_READ_BUF_SIZE) as f:
+            for line in itertools.islice(f, limit):
+                if not line.isspace():
+                    out.append(_parse_line(line))
     except Exception as e:
-        out.append({"error": str(e)})
+        return [{"error": str(e)}]
     return out
 
-def _find_owning_root(path: Path) -> Optional[Path]:
-    rp = path.resolve()
-    for root in SEARCH_ROOTS:
+def _parse_line(line: bytes):
+    try:
+        return _loads(line)
+    except Exception:
+        # Slow path: drop undecodable bytes like the old text-mode reader did
+        text = line.decode("utf-8", "ignore").strip()
         try:
-            rp.relative_to(root.resolve())
-            return root
+            return json.loads(text)
         except Exception:
-            continue
+            return {"_raw": text}
+
+def _iter_ndjson(f) -> Iterator[bytes]:
+    """Re-emit an open JSONL file as normalized NDJSON, one record at a time; closes f."""
+    with f:
+        for line in f:
+            if not line.isspace():
+                yield _dumps(_parse_line(line)) + b"\n"
+
+def _is_under(rp: str, root: str) -> bool:
+    return rp == root or rp.startswith(root if root.endswith(os.sep) else root + os.sep)
+
+# SEARCH_ROOTS are resolved at load; longest first so the most specific root wins
+_RESOLVED_ROOTS = sorted(((str(r), r) for r in SEARCH_ROOTS), key=lambda t: len(t[0]), reverse=True)
+
+@lru_cache(maxsize=4096)
+def _owning_root_for(rp: str) -> Optional[Path]:
+    for root_str, root in _RESOLVED_ROOTS:
+        if _is_under(rp, root_str):
+            return root
     return None
 
+def _find_owning_root(path: Path) -> Optional[Path]:
+    return _owning_root_for(os.path.realpath(path))
+
 # ---------- API Routes ----------
+# Directory scans get their own small limiter so a slow /api/files can't
+# exhaust the shared threadpool that serves every other sync route.
+_SCAN_LIMITER: Optional[anyio.CapacityLimiter] = None
+
+def _scan_limiter() -> anyio.CapacityLimiter:
+    global _SCAN_LIMITER
+    if _SCAN_LIMITER is None:
+        _SCAN_LIMITER = anyio.CapacityLimiter(min(8, os.cpu_count() or 1))
+    return _SCAN_LIMITER
+
 @app.get("/api/host")
-def api_host():
+async def api_host():
     return _host_info()
 
 @app.get("/api/health")
-def api_health():
+async def api_health():
     return {
         "ok": True,
         "host": _host_info(),
@@ -203,89 +387,160 @@ def api_health():
     }
 
 @app.get("/api/tree")
-def api_tree(
+async def api_tree(
     path: Optional[str] = Query(None),
     ext: Optional[str] = Query("json,jsonl"),
 ):
-    exts = [e.strip() for e in (ext.split(",") if ext else []) if e.strip()]
+    ext_set = _parse_exts(ext or "")
+    return await anyio.to_thread.run_sync(_tree_payload, path, ext_set, limiter=_scan_limiter())
+
+def _tree_payload(path: Optional[str], ext_set: frozenset) -> dict:
     if path:
         p = Path(path)
         if not p.exists() or not p.is_dir():
             raise HTTPException(404, f"Not a directory: {path}")
-        nodes = iter_tree(p, exts)
+        nodes = iter_tree(p, ext_set)
         return {"path": str(p.resolve()), "nodes": nodes}
     roots = [str(r) for r in SEARCH_ROOTS if r.exists()]
     return {"path": None, "roots": roots}
 
 @app.get("/api/files")
-def api_files(
+async def api_files(
     ext: Optional[str] = Query("json,jsonl"),
     max_files: int = Query(None),
+    same_fs: Optional[bool] = Query(None),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
 ):
-    exts = [e.strip() for e in (ext.split(",") if ext else []) if e.strip()]
+    """format=ndjson streams one {"path": ...} line per hit as the walk finds it."""
+    ext_set = _parse_exts(ext or "")
     limit = max_files or MAX_FILES
-    found = []
-    for root in SEARCH_ROOTS:
-        for r, dirs, files in os.walk(root, topdown=True):
-            dirs[:] = [d for d in dirs if not _prune_dir(Path(r, d))]
-            for f in files:
-                p = Path(r, f)
-                if exts and p.suffix.lower() not in _norm_exts(exts):
-                    continue
-                found.append(str(p))
-                if len(found) >= limit:
-                    return {"count": len(found), "files": found}
+    same_fs = SAME_FS if same_fs is None else same_fs
+    if format == "ndjson":
+        return StreamingResponse(_files_ndjson(ext_set, limit, same_fs), media_type="application/x-ndjson")
+    found = await anyio.to_thread.run_sync(_collect_files, ext_set, limit, same_fs, limiter=_scan_limiter())
     return {"count": len(found), "files": found}
 
+def _roots_signature() -> tuple:
+    """Root mtimes: a cheap change signal for top-level adds/removes (the TTL covers deeper ones)."""
+    sig = []
+    for root in SEARCH_ROOTS:
+        try:
+            sig.append(os.stat(root).st_mtime_ns)
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+def _files_cache_get(key: tuple) -> Optional[List[str]]:
+    with _FILES_LOCK:
+        hit = _FILES_CACHE.get(key)
+        if hit and time.monotonic() - hit[0] < FILES_CACHE_TTL:
+            _FILES_CACHE.move_to_end(key)
+            return hit[1]
+    return None
+
+def _files_cache_put(key: tuple, ts: float, found: List[str]) -> None:
+    with _FILES_LOCK:
+        _FILES_CACHE[key] = (ts, found)
+        _FILES_CACHE.move_to_end(key)
+        while len(_FILES_CACHE) > FILES_CACHE_SIZE:
+            _FILES_CACHE.popitem(last=False)
+
+def _collect_files(ext_set: frozenset, limit: int, same_fs: bool = False) -> List[str]:
+    """Cached wrapper around _walk_roots, keyed on the query and root mtimes."""
+    key = (ext_set, limit, same_fs, _roots_signature())
+    found = _files_cache_get(key)
+    if found is None:
+        now = time.monotonic()
+        found = _walk_roots(ext_set, limit, same_fs)
+        _files_cache_put(key, now, found)
+    return found
+
+def _iter_roots(ext_set: frozenset, same_fs: bool) -> Iterator[str]:
+    for root in SEARCH_ROOTS:
+        yield from iter_files(str(root), ext_set, same_fs)
+
+def _walk_roots(ext_set: frozenset, limit: int, same_fs: bool) -> List[str]:
+    return list(itertools.islice(_iter_roots(ext_set, same_fs), limit))
+
+def _next_batch(it: Iterator[str], max_items: int = 256, max_wait: float = 0.05) -> List[str]:
+    """Pull up to max_items from `it`, returning early once max_wait seconds have passed."""
+    batch = []
+    deadline = time.perf_counter() + max_wait
+    for item in it:
+        batch.append(item)
+        if len(batch) >= max_items or time.perf_counter() >= deadline:
+            break
+    return batch
+
+async def _files_ndjson(ext_set: frozenset, limit: int, same_fs: bool) -> AsyncIterator[bytes]:
+    """Stream the walk in small batches, each run on the scan limiter; a finished walk fills the cache."""
+    key = (ext_set, limit, same_fs, _roots_signature())
+    found = _files_cache_get(key)
+    if found is not None:
+        yield b"".join(_dumps({"path": f}) + b"\n" for f in found)
+        return
+    now = time.monotonic()
+    it = itertools.islice(_iter_roots(ext_set, same_fs), limit)
+    found = []
+    while True:
+        batch = await anyio.to_thread.run_sync(_next_batch, it, limiter=_scan_limiter())
+        if not batch:
+            break
+        found.extend(batch)
+        yield b"".join(_dumps({"path": f}) + b"\n" for f in batch)
+    _files_cache_put(key, now, found)
+
 @app.get("/api/parent")
 def api_parent(path: str = Query(...)):
-    p = Path(path).resolve()
-    if not p.exists():
+    rp = os.path.realpath(path)
+    if not os.path.exists(rp):
         raise HTTPException(404, f"Not found: {path}")
-    owner = _find_owning_root(p)
-    parent = p.parent if p.parent != p else None
-    if owner and parent:
-        try:
-            parent.resolve().relative_to(owner.resolve())
-        except Exception:
-            parent = None
-    return {"path": str(p), "parent": str(parent) if parent else None, "root": str(owner) if owner else None}
+    owner = _owning_root_for(rp)
+    parent = os.path.dirname(rp)
+    if parent == rp or (owner and not _is_under(parent, str(owner))):
+        parent = None
+    return {"path": rp, "parent": parent, "root": str(owner) if owner else None}
 
 @app.get("/api/breadcrumbs")
 def api_breadcrumbs(path: str):
-    p = Path(path)
-    if not p.is_absolute():
-        p = Path("/") / path.lstrip("/")
-    rp = p.resolve()
-    owner = _find_owning_root(rp)
+    if not os.path.isabs(path):
+        path = "/" + path.lstrip("/")
+    rp = os.path.realpath(path)
+    owner = _owning_root_for(rp)
     crumbs = []
     if owner is None:
-        parts = rp.parts
-        accum = Path(parts[0])
-        for part in parts[1:]:
-            accum = accum / part
-            crumbs.append({"label": part, "path": str(accum), "type": "dir"})
-        if rp.exists() and rp.is_file():
+        cum = ""
+        for part in rp.split(os.sep):
+            if part:
+                cum += os.sep + part
+                crumbs.append({"label": part, "path": cum, "type": "dir"})
+        if crumbs and os.path.isfile(rp):
             crumbs[-1]["type"] = "file"
         return {"root": None, "crumbs": crumbs}
 
-    rel = rp.relative_to(owner.resolve())
-    accum = owner.resolve()
-    crumbs.append({"label": str(owner), "path": str(owner.resolve()), "type": "root"})
-    for seg in rel.parts:
-        accum = accum / seg
-        crumbs.append({
-            "label": seg,
-            "path": str(accum),
-            "type": "file" if accum.exists() and accum.is_file() else "dir"
-        })
-    return {"root": str(owner.resolve()), "crumbs": crumbs}
+    owner_str = str(owner)
+    crumbs.append({"label": owner_str, "path": owner_str, "type": "root"})
+    # rp is fully resolved, so every segment above the last is a directory;
+    # only the terminal one needs a stat
+    cum = owner_str.rstrip(os.sep)
+    for seg in rp[len(owner_str):].split(os.sep):
+        if seg:
+            cum += os.sep + seg
+            crumbs.append({"label": seg, "path": cum, "type": "dir"})
+    if len(crumbs) > 1 and os.path.isfile(rp):
+        crumbs[-1]["type"] = "file"
+    return {"root": owner_str, "crumbs": crumbs}
 
 @app.get("/api/read")
-def api_read(name: Optional[str] = Query(None), path: Optional[str] = Query(None)):
+def api_read(
+    name: Optional[str] = Query(None),
+    path: Optional[str] = Query(None),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
     """
     Read JSON/JSONL file. Accepts absolute or relative paths; relative paths are
-    normalized to absolute (prefixing '/' on POSIX).
+    normalized to absolute (prefixing '/' on POSIX). format=ndjson streams a
+    .jsonl file record by record instead of returning a capped JSON array.
     """
     raw = name if name else path
     if not raw:
@@ -295,11 +550,19 @@ def api_read(name: Optional[str] = Query(None), path: Optional[str] = Query(None
     if not os.path.isabs(raw):
         raw = "/" + raw.lstrip("/")
 
-    p = Path(raw).resolve()
-    if not p.exists():
-        raise HTTPException(404, f"File not found: {p}")
+    rp = os.path.realpath(raw)
+    if not os.path.exists(rp):
+        raise HTTPException(404, f"File not found: {rp}")
 
-    ext = p.suffix.lower()
+    p = Path(rp)
+    ext = _suffix(p.name)
+    if ext == ".jsonl" and format == "ndjson":
+        # Open before streaming so failures get the same payload as JSON mode, not a broken stream
+        try:
+            f = open(p, "rb", buffering=_READ_BUF_SIZE)
+        except Exception as e:
+            return [{"error": str(e)}]
+        return StreamingResponse(_iter_ndjson(f), media_type="application/x-ndjson")
     if ext == ".jsonl":
         data = _safe_jsonl(p)
     elif ext == ".json":
@@ -1,56 +1,189 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, Response
+from fastapi import FastAPI, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder
 from pathlib import Path
 import json
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 
 # -------------------------------------------------------------
 # CONFIGURATION
 # -------------------------------------------------------------
-BASE_DIR = Path("/home/todd/viewer")
+BASE_DIR = Path(os.getenv("VIEWER_BASE_DIR", "/home/todd/viewer"))
 TEMPLATES_DIR = BASE_DIR / "templates"
+# Template auto-reload and uvicorn --reload are for development only
+DEV = os.getenv("VIEWER_DEV") == "1"
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that falls back to JSONResponse's stdlib encoder for values orjson rejects."""
+    def render(self, content) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:  # orjson.JSONEncodeError: int wider than 64 bits
+            return JSONResponse.render(self, content)
+
+
+class _NDJSONPassthroughResponder(GZipResponder):
+    """GZipResponder that sends NDJSON streams as is: gzip would hold each short line back."""
+    passthrough = False
+
+    async def send_with_gzip(self, message) -> None:
+        if message["type"] == "http.response.start":
+            ctype = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = ctype.startswith("application/x-ndjson")
+        if self.passthrough:
+            await self.send(message)
+        else:
+            await super().send_with_gzip(message)
+
 
-app = FastAPI()
+class _GZipMiddleware(GZipMiddleware):
+    """GZip for everything except application/x-ndjson, whose records must go out as they're produced."""
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = _NDJSONPassthroughResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+app = FastAPI(default_response_class=FastJSONResponse)
+app.add_middleware(_GZipMiddleware, minimum_size=1024, compresslevel=5)
 from fastapi.staticfiles import StaticFiles
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+try:
+    (BASE_DIR / ".jinja_cache").mkdir(exist_ok=True)
+    templates.env.bytecode_cache = FileSystemBytecodeCache(str(BASE_DIR / ".jinja_cache"), "%s.cache")
+except OSError as e:
+    print(f"[viewer] Warning: bytecode cache disabled: {e}")
+templates.env.auto_reload = DEV
+
+# Same VIEWER_SEARCH_ROOTS / VIEWER_SKIP_DIRS (os.pathsep-separated) as jvu.py and jsonl_ui.py
+ROOT_DIRS = [p for p in os.getenv("VIEWER_SEARCH_ROOTS", "/").split(os.pathsep) if p.strip()]
 
 # Directories we don’t want to traverse from /
-SKIP_DIRS = {
+DEFAULT_SKIP_DIRS = {
     "/proc", "/sys", "/dev", "/run", "/snap", "/tmp",
     "/lost+found", "/var/lib/docker", "/var/lib/containers"
 }
+_skip_raw = os.getenv("VIEWER_SKIP_DIRS")
+SKIP_DIRS = DEFAULT_SKIP_DIRS if _skip_raw is None else {p for p in _skip_raw.split(os.pathsep) if p.strip()}
+
+# Bigger buffered reads; readline already finds newlines with memchr
+READ_BUF_SIZE = 1024 * 1024
+# Per-request caps for /api/read on JSONL so one huge file can't exhaust memory
+MAX_READ_BYTES = int(os.getenv("VIEWER_MAX_READ_BYTES", str(64 * 1024 * 1024)))
+MAX_READ_ROWS = 50_000
+
+# Top-level subtrees are walked concurrently; scandir releases the GIL during syscalls
+WALK_WORKERS = int(os.getenv("VIEWER_WALK_WORKERS", "8"))
+
+# A full walk is slow; reuse it until a root changes or the TTL runs out
+FILES_CACHE_TTL = 10.0
+_FILES_CACHE = {"key": None, "ts": 0.0, "files": []}
 
 # -------------------------------------------------------------
 # HELPERS
 # -------------------------------------------------------------
-def safe_jsonl_load(path: Path, limit: int = 5000):
-    """Load JSONL safely with fallback for broken lines."""
+# orjson silently turns integers outside the 64-bit range into floats; any 19+ digit
+# run may be one, so those inputs are re-parsed with stdlib json to keep them exact
+_LONG_DIGITS = re.compile(rb"\d{19,}")
+
+
+def _loads(data: bytes):
+    obj = orjson.loads(data)
+    if _LONG_DIGITS.search(data):
+        return json.loads(data)
+    return obj
+
+
+def _dumps(obj) -> bytes:
+    try:
+        return orjson.dumps(obj)
+    except TypeError:  # orjson.JSONEncodeError: int wider than 64 bits
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _parse_line(line: bytes):
+    """orjson first; fall back to stdlib json (NaN, bad UTF-8), then raw text.
+
+    orjson skips the surrounding whitespace itself, so callers pass raw lines
+    and only this slow path pays for a stripped copy.
+    """
+    try:
+        return _loads(line)
+    except orjson.JSONDecodeError:
+        text = line.strip().decode("utf-8", "ignore")
+        try:
+            return json.loads(text)
+        except Exception:
+            return {"raw": text}
+
+
+def skip_records(f, n: int):
+    """Advance f past its first n non-blank lines without parsing them."""
+    if n <= 0:
+        return
+    for line in f:
+        if not line.isspace():
+            n -= 1
+            if not n:
+                return
+
+
+def safe_jsonl_load(path: Path, limit: int = 5000, offset: int = 0):
+    """Load JSONL safely with fallback for broken lines.
+
+    Stops after MAX_READ_BYTES of input, appending a {"_truncated": True} row.
+    """
     out = []
+    used = 0
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            for i, line in enumerate(f):
-                line = line.strip()
-                if not line:
+        with open(path, "rb", buffering=READ_BUF_SIZE) as f:
+            if offset:
+                skip_records(f, offset)
+            for raw in f:
+                if used + len(raw) > MAX_READ_BYTES:
+                    out.append({"_truncated": True, "scanned_bytes": used})
+                    break
+                used += len(raw)
+                if raw.isspace():
                     continue
-                try:
-                    out.append(json.loads(line))
-                except Exception:
-                    out.append({"raw": line})
-                if i >= limit:
+                out.append(_parse_line(raw))
+                if len(out) >= limit:
                     break
     except Exception as e:
         out.append({"error": str(e)})
     return out
 
 
+def iter_ndjson(f):
+    """Stream an open JSONL file as normalized NDJSON without building the list; closes f."""
+    with f:
+        for line in f:
+            if not line.isspace():
+                yield _dumps(_parse_line(line)) + b"\n"
+
+
 def safe_json_load(path: Path):
     """Load plain JSON safely."""
     try:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            data = _loads(raw)
+        except orjson.JSONDecodeError:
+            data = json.loads(raw.decode("utf-8", "ignore"))
         return data if isinstance(data, list) else [data]
     except Exception as e:
         return [{"error": str(e)}]
@@ -77,6 +210,65 @@ def summarize_schema(records):
     return f"Sample type: {type(first).__name__}"
 
 
+def scan_dir(path: str):
+    """One scandir pass: (JSON/JSONL files, subdirectories to descend into)."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink() and entry.path not in SKIP_DIRS:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith((".jsonl", ".json")):
+                    files.append(entry.path)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+def walk_files(top: str):
+    """Depth-first walk of one subtree, in os.walk order."""
+    files, stack = [], [top]
+    while stack:
+        found, subdirs = scan_dir(stack.pop())
+        files.extend(found)
+        stack.extend(reversed(subdirs))
+    return files
+
+
+def scan_files():
+    """Recursively list all JSON and JSONL files under ROOT_DIRS, skipping system dirs."""
+    files = []
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as pool:
+        for top in ROOT_DIRS:
+            found, subdirs = scan_dir(top)
+            files.extend(found)
+            for sub in pool.map(walk_files, subdirs):
+                files.extend(sub)
+    return files
+
+
+def list_files():
+    """Cached wrapper around scan_files (keyed on root mtimes plus a TTL)."""
+    key = []
+    for root in ROOT_DIRS:
+        try:
+            key.append(os.stat(root).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    key = tuple(key)
+    now = time.monotonic()
+    if _FILES_CACHE["key"] == key and now - _FILES_CACHE["ts"] < FILES_CACHE_TTL:
+        return _FILES_CACHE["files"]
+    files = scan_files()
+    _FILES_CACHE.update(key=key, ts=now, files=files)
+    return files
+
+
 # -------------------------------------------------------------
 # ROUTES
 # -------------------------------------------------------------
@@ -93,20 +285,23 @@ async def view_file(request: Request, path: str):
 
 
 @app.get("/api/files")
-async def api_files():
+def api_files():
     """Recursively list all JSON and JSONL files starting at root, skipping system dirs."""
-    files = []
-    for root, dirs, names in os.walk("/", topdown=True):
-        dirs[:] = [d for d in dirs if os.path.join(root, d) not in SKIP_DIRS]
-        for n in names:
-            if n.endswith(".jsonl") or n.endswith(".json"):
-                files.append(os.path.join(root, n))
-    return {"files": files}
+    return {"files": list_files()}
 
 
 @app.get("/api/read")
-async def api_read(name: str):
-    """Return file contents as a JSON array (no hang, guaranteed)."""
+def api_read(
+    name: str,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(5000, ge=1, le=MAX_READ_ROWS),
+):
+    """Return file contents as a JSON array (no hang, guaranteed).
+
+    For .jsonl, offset/limit page through records. format=ndjson streams the
+    whole file one record per line, uncapped and without the schema summary row.
+    """
     path = Path("/") / name.lstrip("/")
     print(f">> /api/read received: {path}")
 
@@ -117,8 +312,16 @@ async def api_read(name: str):
         return [{"directory": str(path), "items": [p.name for p in path.iterdir()]}]
 
     # Load the file
-    if path.suffix == ".jsonl":
-        data = safe_jsonl_load(path)
+    if path.suffix == ".jsonl" and format == "ndjson":
+        # Open up front so errors get the JSON-mode payload instead of breaking the stream
+        try:
+            f = open(path, "rb", buffering=READ_BUF_SIZE)
+        except Exception as e:
+            data = [{"error": str(e)}]
+        else:
+            return StreamingResponse(iter_ndjson(f), media_type="application/x-ndjson")
+    elif path.suffix == ".jsonl":
+        data = safe_jsonl_load(path, limit, offset)
     elif path.suffix == ".json":
         data = safe_json_load(path)
     else:
@@ -137,7 +340,7 @@ if __name__ == "__main__":
         "viewer:app",
         host="127.0.0.1",
         port=8002,
-        reload=True,
+        reload=DEV,
         reload_dirs=[
             "/home/Projects/toddric/viewer",
             "/home/Projects/toddric/viewer/templates"